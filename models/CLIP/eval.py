@@ -37,25 +37,20 @@ def evaluate(model, dataloader, device):
             logits_per_text = logits_per_image.T
             
             # --- 3. Image-to-Text (I2T) Recall 计算 ---
-            # 对于第 i 张图片，正确的文本索引是 [i*5, i*5+1, ..., i*5+4]
-            
+            # 对于第 i 张图片，正确的文本索引是 [i*5, i*5+1, ..., i*5+4]，即 文本索引 // 5 == i
+            image_ids = torch.arange(num_images, device=device) # [0, 1, 2, ..., N-1]
+
             # I2T Recall@1
             # 找到每张图片最匹配的文本索引
-            i2t_preds_r1 = logits_per_image.argmax(dim=1)
+            i2t_preds_r1 = logits_per_image.argmax(dim=1) # [N]
             # 检查预测是否在正确范围内
-            for i in range(num_images):
-                if (i * 5) <= i2t_preds_r1[i] < ((i + 1) * 5):
-                    i2t_r1_correct += 1
+            i2t_r1_correct += (i2t_preds_r1 // 5 == image_ids).sum().item()
 
             # I2T Recall@5
             # 找到每张图片最匹配的前5个文本索引
-            _, i2t_preds_r5_indices = logits_per_image.topk(5, dim=1)
+            _, i2t_preds_r5_indices = logits_per_image.topk(5, dim=1) # [N, 5]
             # 检查这top-5的预测中，是否有任何一个落在正确的5个答案里
-            for i in range(num_images):
-                pred_indices = set(i2t_preds_r5_indices[i].tolist())
-                true_indices = set(range(i * 5, (i + 1) * 5))
-                if len(pred_indices & true_indices) > 0:
-                    i2t_r5_correct += 1
+            i2t_r5_correct += (i2t_preds_r5_indices // 5 == image_ids.unsqueeze(1)).any(dim=1).sum().item()
 
             # --- 4. Text-to-Image (T2I) Recall 计算 ---
             # 对于第 j 个文本，正确的图片索引是 floor(j / 5)
@@ -44,6 +44,7 @@ def parse_args():
     parser.add_argument("--train", action="store_true", help="Run training only")
     parser.add_argument("--train_sample_rate", type=float, default=0.7, help="train data sample rate")
     parser.add_argument("--eval_sample_rate", type=float, default=0.3, help="eval data sample rate")
+    parser.add_argument("--compile_loss", action="store_true", help="Compile the contrastive loss with torch.compile")
 
     # 模型相关参数
     parser.add_argument("--model_name", type=str, default="openai/clip-vit-base-patch32")
@@ -81,6 +82,10 @@ def train(args, model, dataloader, device):
         device: 训练设备
     """
     criterion = MultiTextContrastiveLoss()
+    if args.compile_loss:
+        # 损失中的逐元素操作（相似度缩放、标签构造、BCE/CE）很小，编译后可以融合成少量 kernel
+        # 最后一个 batch 的图片数量可能不同，因此使用 dynamic=True 避免重复编译
+        criterion = torch.compile(criterion, dynamic=True)
     optimizer = torch.optim.AdamW(model.parameters(), lr=args.learning_rate)
 
     print("Starting training...")
@@ -15,7 +15,7 @@ class StandardContrastiveLoss(nn.Module):
         logits = (image_features @ text_features.T) * logit_scale.exp()
 
         # 创建标签 (对角线为正样本)
-        labels = torch.arange(len(logits)).to(logits.device)
+        labels = torch.arange(len(logits), device=logits.device)
 
         # 计算图像到文本的损失 (行是图像，列是文本)
         loss_i = F.cross_entropy(logits, labels)
@@ -59,7 +59,8 @@ class MultiTextContrastiveLoss(nn.Module):
         # 1. 计算 loss_t (文找图): 这是一个标准的多类别分类问题
         # 每个文本都有一个正确的图片目标。
         # 创建标签 [0, 0, 0, 0, 0, 1, 1, 1, 1, 1, ..., N-1, ...]
-        text_labels = torch.arange(num_images, device=device).repeat_interleave(5)
+        # 直接用整除得到，避免 repeat_interleave 额外的复制
+        text_labels = torch.arange(num_texts, device=device) // 5
         loss_t = F.cross_entropy(logits_per_text, text_labels)
 
         # 2. 计算 loss_i (图找文): 这是一个多标签分类问题
@@ -67,12 +68,10 @@ class MultiTextContrastiveLoss(nn.Module):
         # 我们需要创建一个 "多热" (multi-hot) 的标签矩阵。
         # ground_truth shape: [N, 5*N]
         ground_truth = torch.zeros(logits_per_image.shape, dtype=torch.float, device=device)
-        for i in range(num_images):
-            # 将图片i对应的5个文本位置标记为1
-            start_idx = i * 5
-            end_idx = start_idx + 5
-            ground_truth[i, start_idx:end_idx] = 1.0
-        
+        # 图片i对应的5个文本位置为 [i*5, i*5+5)，用一次 scatter_ 标记为1，代替逐图片的 Python 循环
+        positive_idx = torch.arange(num_texts, device=device).view(num_images, 5) # [N, 5]
+        ground_truth.scatter_(1, positive_idx, 1.0)
+
         # 使用二元交叉熵损失 (Binary Cross Entropy)
         # 它将每个输出logit视为一个独立的二元分类（是/不是 正确的匹配）
         loss_i = F.binary_cross_entropy_with_logits(logits_per_image, ground_truth)
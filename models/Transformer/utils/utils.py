@@ -1,4 +1,5 @@
 import torch
+from functools import lru_cache
 
 def get_encoder_self_attention_mask(src_seq: torch.Tensor, pad_idx: int = 0) -> torch.Tensor:
     """
@@ -46,6 +47,14 @@ def get_decoder_cross_attention_mask(src_seq: torch.Tensor, trg_seq: torch.Tenso
 
     return cross_attn_mask
 
+@lru_cache(maxsize=256)
+def _get_look_ahead_mask(seq_len: int, device: torch.device) -> torch.Tensor:
+    """
+    生成并缓存下三角前瞻掩码，形状为 [seq_len, seq_len]。
+    返回的张量会被多次复用，调用方只能对其做非原地操作（如 expand、&）。
+    """
+    return torch.tril(torch.ones(seq_len, seq_len, dtype=torch.bool, device=device))
+
 def get_decoder_self_attention_mask(trg_seq: torch.Tensor, pad_idx: int = 0) -> torch.Tensor:
     """
     生成用于 Transformer 解码器自注意力的序列掩码。
@@ -55,8 +64,8 @@ def get_decoder_self_attention_mask(trg_seq: torch.Tensor, pad_idx: int = 0) ->
     batch_size, seq_len_trg = trg_seq.shape
     device = trg_seq.device
 
-    # 1. 前瞻掩码
-    look_ahead_mask = torch.tril(torch.ones(seq_len_trg, seq_len_trg, dtype=torch.bool, device=device))
+    # 1. 前瞻掩码（按 (seq_len, device) 缓存，逐步解码时不再重复构造）
+    look_ahead_mask = _get_look_ahead_mask(seq_len_trg, device)
     look_ahead_mask = look_ahead_mask.unsqueeze(0).expand(batch_size, -1, -1) 
 
     # 2. 填充掩码